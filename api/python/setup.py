@@ -33,7 +33,7 @@ setup(
         'vds1022': ['fwr/*.bin'],
     },
     include_package_data=True,
-    python_requires='>=3.4',
+    python_requires='>=3.8',
     install_requires=[
         'pyusb',
         'numpy',
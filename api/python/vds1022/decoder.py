@@ -26,37 +26,42 @@ def decode_i2c(frames):
     x_trans = frames[0].tx  # x translate, seconds
 
     # Convert ADC level to logic level 0, 1
-    scl = frames[0].to_ttl()
-    sda = frames[1].to_ttl()
+    scl = frames[0]._get_ttl()
+    sda = frames[1]._get_ttl()
 
     # Compute [n+1]-[n] so that 0=no change, 1=rise, -1=fall
-    scl_diff = (scl[1:] - scl[:-1])
-    sda_diff = (sda[1:] - sda[:-1])
+    scl_diff = np.subtract(scl[1:], scl[:-1], dtype=np.int8)
+    sda_diff = np.subtract(sda[1:], sda[:-1], dtype=np.int8)
 
-    # Get indexes of start/stop edges 
-    edges = [ i for i in range(len(sda_diff))
-              if sda_diff[i] and scl[i] and not scl_diff[i] ]
+    # Get indexes of start/stop edges (sda change while scl is steady high)
+    edges = np.flatnonzero((sda_diff != 0) & (scl[:-1] != 0) & (scl_diff == 0))
 
-    for j, start in enumerate(edges):  # sda start stop edges
-        if sda_diff[start] < 0:  # sda fall for start or re-start 
-            try:
-                stop = edges[j + 1]  # re-start or stop
-            except IndexError:
-                stop = len(scl_diff)  # in case stop is missing
+    # Get the start or re-start edges (sda fall) and the following re-start or stop
+    ii = np.flatnonzero(sda_diff[edges] < 0)
+    starts = edges[ii]
+    stops = np.append(edges, len(scl_diff))[ii + 1]  # in case stop is missing
 
-            # read each bit on clk fall between start and stop
-            mbits = [ sda[i] for i in range(start, stop) if scl_diff[i] < 0 ]
+    # read each bit on clk fall and locate the bits of each message
+    falls = np.flatnonzero(scl_diff < 0)
+    bits = sda[falls]
+    firsts = np.searchsorted(falls, starts)
+    lasts = np.searchsorted(falls, stops)
 
-            # payload bits to bytes, msb first (without START, ACK, NACK, STOP)
-            mbytes = [ _pack_msb(mbits, i, 8) for i in range(1, len(mbits), 9) ]
+    for start, stop, i, j in zip(starts, stops, firsts, lasts):
+        mbits = bits[i: j].tobytes()
 
-            # message start/stop time relative to trigger (seconds)
-            x_start = x_trans + x_scale * start
-            x_stop  = x_trans + x_scale * stop
+        # payload bits to bytes, msb first (without START, ACK, NACK, STOP)
+        dbits = np.frombuffer(mbits, np.uint8)[1:]
+        dbits = np.pad(dbits, (0, -len(dbits) % 9)).reshape(-1, 9)[:, :8]
+        mbytes = np.packbits(dbits, axis=1).tobytes()
 
-            if len(mbytes):
-                msg = I2C(x_start, x_stop, bytes(mbits), bytes(mbytes))
-                results.append(msg)
+        # message start/stop time relative to trigger (seconds)
+        x_start = x_trans + x_scale * start
+        x_stop  = x_trans + x_scale * stop
+
+        if len(mbytes):
+            msg = I2C(x_start, x_stop, mbits, mbytes)
+            results.append(msg)
 
     return results
 
@@ -96,9 +101,9 @@ def decode_uart(frames, baud=None, bits=8, parity=None, msb=False):
 
     for frame in frames:
         # Convert ADC level to logic level 0, 1
-        data = frame.to_ttl()
+        data = frame._get_ttl()
         # Compute [n+1]-[n] so that 0=no change, 1=rise, -1=fall
-        diff = data[1:] - data[:-1]
+        diff = np.subtract(data[1:], data[:-1], dtype=np.int8)
         # Get indexes of all edges
         edges = np.nonzero(diff)[0]
         # Get minimum pulse width
@@ -115,6 +120,7 @@ def decode_uart(frames, baud=None, bits=8, parity=None, msb=False):
                 baud, _format_time(1 / baud)))
 
     results = []
+    starts = []
 
     # number of bits (START DATA PARITY STOP)
     size = 1 + bits + (0 if parity is None else 1) + 1
@@ -124,24 +130,25 @@ def decode_uart(frames, baud=None, bits=8, parity=None, msb=False):
 
         # points per bit
         bit_pts = 1 / baud / frame.sx
+        # points from center of first bit to center of each bit
+        offsets = np.arange(size) * bit_pts
 
         p = 0
         for start in edges:
             if start >= p:
                 p = start + 1 + bit_pts * 0.4  # jump to center of first bit
-                try:
-                    # read center of bits at a fixed period
-                    mbits = [ data[round(p + i * bit_pts)] for i in range(0, size) ]
-                except IndexError:
+
+                # read center of bits at a fixed period
+                indexes = np.rint(p + offsets).astype(np.intp)
+                if indexes[-1] >= len(data):
                     continue
+                mbits = data[indexes]
 
                 if not mbits[0] and mbits[-1]:
                     # decode if first is low and last is high
-                    cs = (parity or 0) & 1
-                    val = 0
-                    for b in mbits[1:last] if msb else mbits[last-1:0:-1]:
-                        val = (val << 1) | b
-                        cs ^= b
+                    dbits = mbits[1:last] if msb else mbits[last-1:0:-1]
+                    val = int.from_bytes(np.packbits(dbits).tobytes(), 'big') >> (-bits % 8)
+                    cs = int(np.bitwise_xor.reduce(dbits)) ^ (parity or 0) & 1
 
                     # check parity bit if any (True if matches)
                     err = parity is not None and cs != mbits[-2]
@@ -152,12 +159,13 @@ def decode_uart(frames, baud=None, bits=8, parity=None, msb=False):
 
                     msg = UART(frame.channel, x_start, x_stop, val, err)
                     results.append(msg)
+                    starts.append(x_start)
 
                     # jump to center of last bit
                     p = start + bit_pts * (size - 0.4)
 
-    results.sort(key=lambda x: x.start)
-    return results
+    # merge the channels by start time
+    return [ results[i] for i in np.argsort(starts, kind='stable') ]
 
 
 class UART:
@@ -190,15 +198,14 @@ def decode_wire(frame):
     Returns:
         list: [ WIRE(...), ... ]
     """
-    results = []
     x_scale = frame.sx  # x scale, seconds per ADC sample
     x_trans = frame.tx  # x translate, seconds
     channel = frame.channel
 
     # Convert ADC level to logic level 0, 1
-    ttl = frame.to_ttl()
+    ttl = frame._get_ttl()
     # Compute [n+1]-[n] so that 0=no change, 1=rise, -1=fall
-    diff = ttl[1:] - ttl[:-1]
+    diff = np.subtract(ttl[1:], ttl[:-1], dtype=np.int8)
     # Get indexes of all edges
     edges = np.nonzero(diff)[0]
     # Get indexes of all falling edges
@@ -207,38 +214,29 @@ def decode_wire(frame):
     bit_pts = (edges_fall[1:] - edges_fall[:-1]).min()
     bit_half_pts = bit_pts / 2
 
-    value = 0
-    n = 0
-
-    for i, start in enumerate(edges):
-
-        # continue if not falling edge
-        if diff[start] != -1:
-            continue
-
-        # next rising edge if any
-        try:
-            pts = edges[i + 1] - start
-            if pts > bit_pts:   # reset
-                n = 0
-                continue
-        except IndexError:
-            break
-
-        # unpack bit
-        n += 1
-        bit = int(pts < bit_half_pts)
-        value = (value >> 1) | (bit << 7)  # to 8 bits lsb first
-
-        if n == 1:  # if first bit
-            x_start = x_trans + x_scale * (1 + start)
-        elif n == 8:  # if last bit
-            n = 0
-            x_stop = x_trans + x_scale * (1 + start + bit_pts)
-            msg = WIRE(channel, x_start, x_stop, value)
-            results.append(msg)
+    # Get falling edges followed by a rising edge and the low pulse widths
+    ii = np.nonzero(diff[edges[:-1]] == -1)[0]
+    starts = edges[ii]
+    pts = edges[ii + 1] - starts
 
-    return results
+    # A pulse longer than a bit is a reset, otherwise a bit (1 if short)
+    valid = pts <= bit_pts
+    bits = (pts < bit_half_pts).view(np.uint8)
+
+    # Get the position of each bit since the last reset
+    count = np.cumsum(valid)
+    n = count - np.maximum.accumulate(np.where(valid, 0, count))
+
+    # Get indexes of the last bit of each byte and pack, lsb first
+    ends = np.nonzero(valid & (n % 8 == 0))[0]
+    values = np.packbits(bits[ends[:, None] + np.arange(-7, 1)], axis=1, bitorder='little')[:, 0]
+
+    # message start/stop time relative to trigger (seconds)
+    x_starts = x_trans + x_scale * (1 + starts[ends - 7])
+    x_stops  = x_trans + x_scale * (1 + starts[ends] + bit_pts)
+
+    return [ WIRE(channel, x_start, x_stop, int(value))
+             for x_start, x_stop, value in zip(x_starts, x_stops, values) ]
 
 
 class WIRE:
@@ -260,17 +258,13 @@ class WIRE:
 
 
 
-def _pack_msb(bits, start, count):
-    v = 0
-    for b in bits[start: start + count]:
-        v = (v << 1) | b
-    shift = start + count - len(bits)
-    return (v << shift) if shift > 0 else v
+_TIME_UNITS = ( (1, 's'), (1e3, 'ms'), (1e6, 'µs'), (1e9, 'ns'), (1e12, 'ps') )
 
 
 def _format_time(x, ndigits=4):
-    n = 0
-    while x and abs(x) < 0.1:
-        x *= 1e3
-        n += 1
-    return format(round(x, ndigits), 'g') + ' mµnp'[n][:n] + 's' if x else '0'
+    if not x:
+        return '0'
+    a = abs(x)
+    n = 0 if a >= 0.1 else 1 if a >= 1e-4 else 2 if a >= 1e-7 else 3 if a >= 1e-10 else 4
+    scale, unit = _TIME_UNITS[n]
+    return format(round(x * scale, ndigits), 'g') + unit
@@ -17,8 +17,10 @@ FORMATS = {
 
 
 def _to_type(data, dtype):
+    # clip and cast in a single pass
     info = np.iinfo(dtype)
-    return data.clip(info.min, info.max).astype(dtype)
+    out = np.empty(len(data), dtype)
+    return np.clip(data, info.min, info.max, out=out, casting='unsafe')
 
 
 
@@ -28,27 +30,33 @@ class FStream:
         self.samples = _to_type(samples, dtype)
         self.period  = period
         self.index   = 0.0
+        self._base   = np.arange(0)  # relative indexes of a read
+        self._take   = np.arange(0)  # absolute indexes of a read
 
 
-    def read(self, size):
+    def read(self, size, out=None):
         start = round(self.index)
         self.index = (self.index + size) % self.period
-        return self.samples[start: start + size]
+
+        if len(self._base) != size:
+            self._base = np.arange(size)
+            self._take = np.empty(size, self._base.dtype)
+
+        # gather the samples, wrapped if the buffer end is reached
+        np.add(self._base, start, out=self._take)
+        return np.take(self.samples, self._take, mode='wrap', out=out)
 
 
     def add(self, samples, period):
 
         assert period < self.period
 
-        a, b = self.samples, samples
-        diff = len(a) - len(b)
+        # mix in place into the new samples, trimmed to the shortest
+        size = min(len(self.samples), len(samples))
+        mix = samples[:size]
+        mix += self.samples[:size]
 
-        if diff > 0:
-            a = a[:-abs(diff)]
-        elif diff < 0:
-            b = b[:-abs(diff)]
-
-        self.samples = _to_type(a + b, a.dtype)
+        self.samples = _to_type(mix, self.samples.dtype)
 
 
 
@@ -56,6 +64,8 @@ class Generator:
 
     _instance = None
 
+    _sample_rates = { }  # (device, dtype, channels, freq) -> sample rate
+
 
     def __new__(cls, *args, **kwargs):
         self = cls._instance
@@ -99,16 +109,24 @@ class Generator:
 
 
     def stop(self):
-        if self.stream is not None:
-            pa.close(self.stream)
-            self.stream = None
-            self.frames = None
+        with self.lock:
+            if self.stream is not None:
+                pa.close(self.stream)
+                self.stream = None
+                self.frames = None
 
-        pa.terminate()
+            pa.terminate()
 
 
     def _set_sampling(self, freq):
 
+        if self.sample_rate is not None:
+            return
+
+        # probing the formats is slow, reuse the rate found for this output
+        key = (self.device, self.dtype, self.channels, freq)
+        self.sample_rate = self._sample_rates.get(key)
+
         if self.sample_rate is None:
 
             self.sample_rate = self.default_sample_rate
@@ -127,8 +145,10 @@ class Generator:
                 except ValueError:
                     break
 
-            period = self.sample_rate / freq
-            self.size = round(ceil(self.size / period) * period)
+            self._sample_rates[key] = self.sample_rate
+
+        period = self.sample_rate / freq
+        self.size = round(ceil(self.size / period) * period)
 
 
     def sine(self, freq, shift=0, scale=1, channel=None):
@@ -138,10 +158,11 @@ class Generator:
         period  = self.sample_rate / freq
         start   = int(period * ((1.0 + shift) % 1))
         stop    = int(start + self.size + period * 2) - 1
-        t       = np.arange(start, stop)
-        samples = np.sin(2 * np.pi / period * t)
+        samples = np.arange(start, stop, dtype=np.float64)
+        samples *= 2 * np.pi / period
+        np.sin(samples, out=samples)
 
-        self.add(samples, period, channel, scale)
+        self._add(samples, period, channel, scale)
         return self
 
 
@@ -152,10 +173,11 @@ class Generator:
         period  = self.sample_rate / freq
         start   = int(period * ((1.0 + shift) % 1))
         stop    = int(start + self.size + period)
-        t       = np.arange(start, stop)
-        samples = 2 * (((t % period) < (period * duty)) - 0.5)
+        t       = np.arange(start, stop, dtype=np.float64)
+        np.remainder(t, period, out=t)
+        samples = np.where(t < period * duty, 1.0, -1.0)
 
-        self.add(samples, period, channel, scale)
+        self._add(samples, period, channel, scale)
         return self
 
 
@@ -166,10 +188,12 @@ class Generator:
         period  = self.sample_rate / freq
         start   = int(period * ((1.5 + shift) % 1))
         stop    = int(start + self.size + period)
-        t       = np.arange(start, stop)
-        samples = 2 / period * (t % period) - 1
+        samples = np.arange(start, stop, dtype=np.float64)
+        np.remainder(samples, period, out=samples)
+        samples *= 2 / period
+        samples -= 1
 
-        self.add(samples, period, channel, scale)
+        self._add(samples, period, channel, scale)
         return self
 
 
@@ -180,10 +204,14 @@ class Generator:
         period  = self.sample_rate / freq
         start   = int(period * ((1.75 + shift) % 1))
         stop    = start + int(self.size + period)
-        t       = np.arange(start, stop)
-        samples = np.abs(4 / period * (t % period) - 2) - 1
-
-        self.add(samples, period, channel, scale)
+        samples = np.arange(start, stop, dtype=np.float64)
+        np.remainder(samples, period, out=samples)
+        samples *= 4 / period
+        samples -= 2
+        np.abs(samples, out=samples)
+        samples -= 1
+
+        self._add(samples, period, channel, scale)
         return self
 
 
@@ -193,9 +221,12 @@ class Generator:
 
         c = (f1 - f0) / duration  # chirp rate
         t = np.linspace(0, duration, self.size)
-        samples = np.sin( 2*np.pi*c/2 * (t**2) + 2*np.pi*f0 * t )
+        samples = t * (np.pi * c)  # sin( 2*pi*c/2 * t**2 + 2*pi*f0 * t )
+        samples += 2 * np.pi * f0
+        samples *= t
+        np.sin(samples, out=samples)
 
-        self.add(samples, self.size, channel, scale)
+        self._add(samples, self.size, channel, scale)
 
         return lambda : f0 + (c * t)
 
@@ -206,15 +237,24 @@ class Generator:
 
         k = (f1 / f0) ** (1 / duration)  # rate of exponential change
         t = np.linspace(0, duration, self.size)
-        samples = np.sin( 2*np.pi*f0/np.log(k) * ((k**t)-1) )
+        samples = np.power(k, t)  # sin( 2*pi*f0/log(k) * (k**t - 1) )
+        samples -= 1
+        samples *= 2 * np.pi * f0 / np.log(k)
+        np.sin(samples, out=samples)
 
-        self.add(samples, self.size, channel, scale)
+        self._add(samples, self.size, channel, scale)
 
         return lambda : f0 * (k ** t)
 
 
     def add(self, samples, period, channel=None, scale=1):
 
+        self._add(np.array(samples, np.float64), period, channel, scale)
+
+
+    def _add(self, samples, period, channel, scale):
+        # samples is a temporary float buffer, scaled and mixed in place
+
         self._set_sampling(1 / period)
 
         if channel is None:
@@ -223,12 +263,12 @@ class Generator:
         assert channel < self.channels
         assert len(samples) >= int(self.size)
 
-        dac_samples = (self.max * self.scale * scale) * samples
+        samples *= self.max * self.scale * scale
 
         if channel in self.frames:
-            self.frames[channel].add(dac_samples, period)
+            self.frames[channel].add(samples, period)
         else:
-            self.frames[channel] = FStream(dac_samples, period, self.dtype)
+            self.frames[channel] = FStream(samples, period, self.dtype)
 
 
     def to_dataframe(self):
@@ -251,14 +291,15 @@ class Generator:
         endtime = duration and duration + time.perf_counter()
 
         data = np.zeros((self.size, len(self.frames)), self.dtype)
+        # snapshot read by the audio thread: each stream with its column of data
+        streams = tuple( (frame, data[:, channel]) for channel, frame in self.frames.items() )
 
         def callback(_, size, time_info, status):
             if endtime and time.perf_counter() > endtime:
                 return None, pyaudio.paAbort
-            with self.lock:
-                for channel, frame in self.frames.items():
-                    data[:,channel] = frame.read(size)
-                return data, pyaudio.paContinue
+            for frame, column in streams:
+                frame.read(size, column)
+            return data, pyaudio.paContinue
 
         self.stream = pa.open(
             rate=int(self.sample_rate),
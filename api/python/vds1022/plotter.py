@@ -14,6 +14,8 @@ __all__ = (
 
 _items = lambda x: x if hasattr(x, '__len__') else [ x ]
 
+_float32 = lambda x: np.asarray(x.to_numpy(copy=False), np.float32)  # copy only if not float32
+
 
 class BokehChart:
 
@@ -88,18 +90,14 @@ class BokehChart:
         ds = bokeh.models.ColumnDataSource(data={})
         y_range_name = 'default'
         y_range = p.y_range
+        data = ds.data
 
         for i, line in enumerate(lines):
             xs = _items(line['x'])
-            ys = _items(line['y'])
             xlim = line.get('xlim')
             ylim = line.get('ylim')
-            ds.data['x'] = xs 
-            ds.data[labels[i]] = ys
-
-            if not xlim:
-                xlim = (xs[0] - 1e-9, xs[-1] + 1e-9) if len(xs) > 1 else (0, None)
-            p.x_range.start, p.x_range.end = p.x_range.bounds = xlim
+            data['x'] = xs
+            data[labels[i]] = _items(line['y'])
 
             if ylim:
                 if i > 0 and (y_range.start != ylim[0] or y_range.end != ylim[1]):
@@ -111,6 +109,11 @@ class BokehChart:
             pl = p.line('x', labels[i], source=ds, y_range_name=y_range_name, **axe_opts[i])
             y_range.renderers += (pl,)
 
+        if lines:  # the x column is shared, the last line wins
+            if not xlim:
+                xlim = (xs[0] - 1e-9, xs[-1] + 1e-9) if len(xs) > 1 else (0, None)
+            p.x_range.start, p.x_range.end = p.x_range.bounds = xlim
+
         for ax in p.xaxis:
             ax.ticker.desired_num_ticks = 10
             formatter = self._FORMATTERS.get(xscale)
@@ -143,16 +146,21 @@ class BokehChart:
         lg.border_line_width = 0
         p.add_layout(lg, 'above')
 
-        p.select(type=bokeh.models.ZoomInTool).factor = 0.5
-        p.select(type=bokeh.models.ZoomOutTool).factor = 1
-        p.select(type=bokeh.models.ZoomOutTool).maintain_focus = False
-        p.select(type=bokeh.models.WheelZoomTool).maintain_focus = False
+        for tool in p.toolbar.tools:
+            if isinstance(tool, bokeh.models.ZoomInTool):
+                tool.factor = 0.5
+            elif isinstance(tool, bokeh.models.ZoomOutTool):
+                tool.factor = 1
+                tool.maintain_focus = False
+            elif isinstance(tool, bokeh.models.WheelZoomTool):
+                tool.maintain_focus = False
 
         self.figure = p
         self.handle = None
         self.labels = labels
         self.data_source = ds
         self.rollover = rollover
+        self._xkey = None
 
 
     def __call__(self, source):
@@ -175,6 +183,7 @@ class BokehChart:
         import bokeh.io
 
         source_cls = type(source)
+        xkey = None  # signature of the time axis of Frames
 
         if source_cls is tuple:
             data = { (self.labels[i - 1] if i else 'x'): _items(item) 
@@ -193,23 +202,32 @@ class BokehChart:
             if self.xy_mode:
                 data = { 'x': source.ch1.y(), self.labels[0]: source.ch2.y() }
             else:
-                data = { 'x': source.x() }
+                data = { }
                 for i, frame in enumerate(source):
                     data[self.labels[i]] = frame.y()
+                    if frame.size >= 10:
+                        xkey = (frame.size, frame.tx, frame.sx)
+                if xkey is None or xkey != self._xkey:
+                    data['x'] = source.x()
 
         elif source_cls.__name__ == 'DataFrame':
-            data = { 'x': source.index.to_numpy(dtype=np.float32) }
+            data = { 'x': _float32(source.index) }
             for i, col in enumerate(source):
-                data[self.labels[i]] = source[col].to_numpy(dtype=np.float32)
+                data[self.labels[i]] = _float32(source[col])
 
         else:
             raise ValueError("Invalid argument source")
 
-        if 0 < len(data['x']) < 10:
+        if xkey is not None and xkey == self._xkey:
+            # same time axis as the previous update, only send the y columns
+            self.data_source.data.update(data)
+        elif 0 < len(data['x']) < 10:
             self.data_source.stream(data, self.rollover)
         else:
             self.data_source.data = data
 
+        self._xkey = xkey
+
         # TODO: rollover range
         # if self.rollover is not None and len(ds.data['x']) >= self.rollover:
         #     xr = self.figure.x_range
@@ -6,7 +6,6 @@ This module provides an API to communicate directly with
 the OWON VDS1022 oscilloscope.
 """
 
-import binascii
 import bisect
 import collections
 import datetime
@@ -21,12 +20,13 @@ import struct
 import sys
 import threading
 import time
+import zlib
 
 from array import array
 from copy import copy, deepcopy
 from math import floor, ceil, log2, log10, copysign, sqrt, pi
 
-assert sys.version_info >= (3, 5), "requires Python 3.5 or newer"
+assert sys.version_info >= (3, 8), "requires Python 3.8 or newer"
 
 try:
     from usb.backend import libusb0, libusb1
@@ -191,23 +191,29 @@ class CMD:
             self.size    = struct.size - 5  #: int: value size
             self.struct  = struct           #: Struct: command structure for packing
 
-        def pack(self, arg):
+        def pack(self, arg, buffer=None):
+            # pack into the given array of struct size (owned by a device) or a new array
+            if buffer is None:
+                buffer = array('B', bytes(self.struct.size))
             try:
-                return array('B', self.struct.pack(self.address, self.size, arg))
+                self.struct.pack_into(buffer, 0, self.address, self.size, arg)
+                return buffer
             except Exception as ex:
                 raise ValueError('Failed to pack %s %s into %s' % (
                     self.name, hex(arg), self.struct.format)) from ex
 
         def log(self, arg, ret, buffer):
-            if DEBUG:
-                if ret == 5:
-                    # 5 bytes response : status (1 char), value (u32 or 4 [A-Z] chars)
-                    spec = '<c4s' if all(65 <= c <= 90 for c in buffer[1:5]) else '<cI'
-                    status, value = struct.unpack_from(spec, buffer)
-                    _log("[ %s %s ] %s %s", self.name, hex(arg), status, value)
-                else:
-                    # 5211 bytes response
-                    _log("[ %s %s ] %s bytes", self.name, hex(arg), ret)
+            if not DEBUG:
+                return
+            if ret == 5:
+                # 5 bytes response : status (1 char), value (u32 or 4 [A-Z] chars)
+                status, value = bytes(buffer[0:1]), bytes(buffer[1:5])
+                if not all(65 <= c <= 90 for c in value):
+                    value = int.from_bytes(value, 'little')
+                _log("[ %s %s ] %s %s", self.name, hex(arg), status, value)
+            else:
+                # 5211 bytes response
+                _log("[ %s %s ] %s bytes", self.name, hex(arg), ret)
 
 
     BI   = struct.Struct('<BI')  # u8, u32
@@ -223,7 +229,7 @@ class CMD:
     LOAD_FPGA         =  Cmd('LOAD_FPGA'            , 0x4000, IBI)  # FPGA_DOWNLOAD_ADD
     EMPTY             =  Cmd('EMPTY'                , 0x010c, IBB)  # EMPTY_ADD
     GET_MACHINE       =  Cmd('GET_MACHINE'          , 0x4001, IBB)  # MACHINE_TYPE_ADD
-    GET_DATA          =  Cmd('GET_DATA'             , 0x1000, IBH)  # GETDATA_ADD
+    GET_DATA          =  Cmd('GET_DATA'             , 0x1000, IBH)  # GETDATA_ADD, arg: _CHL_STATES
     GET_TRIGGERED     =  Cmd('GET_TRIGGERED'        ,   0x01, IBB)  # TRG_D_ADD
     GET_VIDEOTRGD     =  Cmd('GET_VIDEOTRGD'        ,   0x02, IBB)  # VIDEOTRGD_ADD
     SET_MULTI         =  Cmd('SET_MULTI'            ,   0x06, IBH)  # SYNCOUTPUT_ADD
@@ -266,6 +272,14 @@ class CMD:
 
 
 
+# GET_DATA argument by channels on state, b0-7:CH1  b8-15:CH2  [ 0x04:OFF 0x05:ON ]
+_CHL_STATES = { (False, False): 0x0404, (True, False): 0x0405,
+                (False, True) : 0x0504, (True, True) : 0x0505 }
+
+# GET_DATA command packed once by channels on state
+_GET_DATA_CMDS = { k: CMD.GET_DATA.pack(v) for k, v in _CHL_STATES.items() }
+
+
 class _FlashStream:
 
     def __init__(self, data):
@@ -277,14 +291,16 @@ class _FlashStream:
 
     def read(self, spec):
         # read structure
-        res = struct.unpack_from(spec, self.buffer, self.position)
-        self.position += struct.calcsize(spec)
+        st = _struct(spec)
+        res = st.unpack_from(self.buffer, self.position)
+        self.position += st.size
         return res if len(res) > 1 else res[0]
 
     def write(self, spec, *values):
         # write structure
-        struct.pack_into(spec, self.buffer, self.position, *values)
-        self.position += struct.calcsize(spec)
+        st = _struct(spec)
+        st.pack_into(self.buffer, self.position, *values)
+        self.position += st.size
 
     def read_str(self):
         # read null terminated string
@@ -301,13 +317,16 @@ class _FlashStream:
 
 
 
+# scalar helpers as conditional expressions, faster than the min/max builtins
 _min = lambda a, b: b if b < a else a
 
 _max = lambda a, b: b if b > a else a
 
 _clip = lambda x, lo, hi: lo if x < lo else hi if x > hi else x
 
-_rms = lambda y: sqrt(np.square(y, dtype=np.float32).mean())
+_rms = lambda y: sqrt(np.dot(y, y) / len(y))
+
+_struct = functools.lru_cache(maxsize=64)(struct.Struct)  # compiled struct by format
 
 _find_ge = lambda arr, x: bisect.bisect_left(arr, x)
 
@@ -319,8 +338,6 @@ _iavg = lambda arr: np.average(range(1, len(arr) + 1), weights=arr) - 1  # weigh
 
 _items = lambda x: x if isinstance(x, (tuple, list)) else (x, )
 
-_bits = lambda arr: sum(1 << i for i, x in enumerate(arr) if x)
-
 _u8 = lambda x: x & 0xff
 
 _u16 = lambda lsb, msb: lsb & 0xff | (msb & 0xff) << 8
@@ -329,13 +346,36 @@ _swap16 = lambda x: (x & 0xff00) >> 8 | (x & 0x00ff) << 8
 
 _to_precision = lambda x, n: round(x, -int(floor(log10(abs(x or 1)))) + (n - 1))
 
+_indexes32 = np.arange(SAMPLES, dtype=np.float32)  # sample indexes of a frame
+
+_adc_values = np.arange(-128, 128)  # ADC value of each histogram bin
 
+
+def _bits(arr):
+    """ Flags to unsigned integer, first flag as least significant bit. """
+    if len(arr) <= 16:
+        return sum(1 << i for i, x in enumerate(arr) if x)
+    bits = np.packbits(np.asarray(arr, dtype=bool), bitorder='little')
+    return int.from_bytes(bits.tobytes(), 'little')
+
+
+@functools.lru_cache(maxsize=256)
 def _iexp10(value, limit):
     """ To unsigned integer mantissa and base-10 exponent.  """
-    m, e = value, 0
-    while m > limit:
-        m, e = m / 10, e + 1
-    return round(m), e
+    if value <= limit:
+        return round(value), 0
+    e = ceil(log10(value / limit))
+    if value / 10 ** (e - 1) <= limit:  # rounding error on an exact power of 10
+        e -= 1
+    return round(value / 10 ** e), e
+
+
+@functools.lru_cache(maxsize=32)
+def _window(window, size):
+    """ Window function samples (read-only) and their mean, cached by function and size. """
+    win = window(size)
+    win.flags.writeable = False
+    return win, float(win.mean())
 
 
 def _rfft(data, window, size):
@@ -346,23 +386,45 @@ def _rfft(data, window, size):
     scale = 2 / size
 
     if window is not None:
-        win   = window(size)
-        data  *= win
-        scale /= win.mean()
+        win, mean = _window(window, size)
+        data  = data * win
+        scale /= mean
 
     return np.fft.rfft(data), scale
 
 
-def _quad_iterp(yy, i):
-    """ Quadratic interpolation of 3 adjacent points
+def _quad_iterp(yy, ii):
+    """ Quadratic interpolation of 3 adjacent points, for an array of indexes
     https://www.dsprelated.com/freebooks/sasp/Quadratic_Interpolation_Spectral_Peaks.html
     """
-    yi = yy[i]
-    yp = yy[i - 1] if i > 0 else yy[i + 1]
-    yn = yy[i + 1] if i + 1 < len(yy) else yy[i - 1]
-    x  = i + 0.5 * (yp - yn) / (yp - 2 * yi + yn)
-    y  = yi - 0.25 * (yp - yn) * (x - i)
-    return x, y
+    yi = yy[ii]
+    yp = yy[np.where(ii > 0, ii - 1, ii + 1)]
+    yn = yy[np.where(ii + 1 < len(yy), ii + 1, ii - 1)]
+    dx = 0.5 * (yp - yn) / (yp - 2 * yi + yn)
+    y  = yi - 0.25 * (yp - yn) * dx
+    return ii + dx, y
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0  # USB transfers in progress with gc paused, shared by all devices
+_gc_resume = False  # True if gc was enabled before the first pause
+
+
+def _pause_gc():
+    global _gc_pauses, _gc_resume
+    with _gc_lock:
+        if not _gc_pauses:
+            _gc_resume = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+
+
+def _resume_gc():
+    global _gc_pauses
+    with _gc_lock:
+        _gc_pauses -= 1
+        if not _gc_pauses and _gc_resume:
+            gc.enable()  # only once the last transfer ends
 
 
 def _printf(spec, *args):
@@ -374,6 +436,9 @@ def _log(spec, *args):
         print(spec % args)
 
 
+_calibrations = {}  # parsed calibration files: { path: (mtime, cals) }
+
+
 def _log_calibration(calibration):
     values = ' '.join(format(x / 10, '5') for x in VOLT_RANGES)
     _log('# VOLTBASE: %s', values)
@@ -434,23 +499,34 @@ class Frame:
 
     def __init__(self, device, channel, buffer, offset, frequency):
         vr = device.voltrange[channel] * device.probe[channel]
-        self.buffer = buffer  # array('b'): ADC raw samples (8 bits signed)
+        self.buffer = np.clip(buffer, ADC_MIN, ADC_MAX)  # ndarray: ADC samples (8 bits signed)
         self.channel = channel  #: int: 0:`CH1` or 1:`CH2`
         self.frequency = frequency  #: float: Measured frequency (Hz).
         self.sx = 1 / device.sampling_rate  # float: X scale, seconds per ADC sample
         self.sy = vr / ADC_RANGE            # float: Y scale, volts per ADC sample
         self.tx = offset / device.sampling_rate     # float: X translate, seconds
         self.ty = vr * -device.voltoffset[channel]  # float: Y translate, volts
+        self._sy32 = np.float32(self.sy)              # float32 Y scale
+        self._ty32 = np.float32(self.ty)              # float32 Y translate
+        self._tysy32 = np.float32(self.ty / self.sy)  # float32 Y translate in ADC samples
 
 
     @property
-    def _points(self):
-        buf = self.buffer
+    def buffer(self):
+        """ ndarray: Samples, the raw ADC samples are viewed as int8 . """
+        return self._points
+
+
+    @buffer.setter
+    def buffer(self, buf):
         if isinstance(buf, array) and buf.itemsize == 1:
             buf = np.frombuffer(buf, np.int8)
             buf.clip(ADC_MIN, ADC_MAX, out=buf)
-            self.buffer = buf
-        return buf
+        self._points = buf
+        self._ys = None      # ndarray: cached y values
+        self._counts = None  # ndarray: cached histogram of the 256 ADC values
+        self._levels = None  # tuple: cached (lo, hi) levels
+        self._ttl = None     # tuple: cached (ratio_low, ratio_high, ttl)
 
 
     @property
@@ -494,14 +570,18 @@ class Frame:
         """
         start = _parse.seconds(start=start)
         stop  = _parse.seconds(stop=stop)
+        return self._slice(start, stop)
+
 
+    def _slice(self, start, stop):
         size = self.size
         i = _clip(round((start - self.tx) / self.sx), 0, size - 1)
         j = _clip(round(((stop or size) - self.tx) / self.sx), 0, size - 1)
 
-        frame = copy(self)
+        frame = object.__new__(type(self))  # shallow copy without copy()
+        frame.__dict__.update(self.__dict__)
         frame.tx += i * self.sx
-        frame.buffer = frame.buffer[i: j]
+        frame.buffer = self._points[i: j]
 
         return frame
 
@@ -517,13 +597,10 @@ class Frame:
             numpy.ndarray: 1D Numpy array of x values in second.
         """
         num = len(self.buffer)
-        if num:
-            start = self.tx
-            # TODO check if it needs num - 1 on stop for continuous mode
-            # stop = start + (num - 1) * self.sx
-            stop = start + num * self.sx
-            return np.linspace(start, stop, num, dtype=np.float32)
-        return np.empty(0, dtype=np.float32)
+        ii = _indexes32[:num] if num <= SAMPLES else np.arange(num, dtype=np.float32)
+        xs = ii * np.float32(self.sx)
+        xs += np.float32(self.tx)
+        return xs
 
 
     def y(self):
@@ -531,7 +608,17 @@ class Frame:
         Returns:
             numpy.ndarray: 1D Numpy array of y values in volt.
         """
-        ys = self._points * np.float32(self.sy) + np.float32(self.ty)
+        return self._y().copy()
+
+
+    def _y(self):
+        # cached y values, read-only since shared by the statistics
+        ys = self._ys
+        if ys is None:
+            ys = self._points * self._sy32
+            ys += self._ty32
+            ys.flags.writeable = False
+            self._ys = ys
         return ys
 
 
@@ -541,7 +628,9 @@ class Frame:
             bool: True if the signal is clipped, False otherwise.
         """
         pts = self._points
-        return pts.itemsize == 1 and int(pts.max()) >= ADC_MAX or int(pts.min()) <= ADC_MIN
+        if pts.itemsize != 1:
+            return False  # not ADC samples (filtered or computed)
+        return bool(np.any((pts >= ADC_MAX) | (pts <= ADC_MIN)))
 
 
     def xy(self):
@@ -559,16 +648,31 @@ class Frame:
         Returns:
             tuple: Voltage for each given percentile.
         """
-        values = np.percentile(self._points, q)
+        values = self._percentile(q)
         return tuple(float(v) * self.sy + self.ty for v in values)
 
 
+    def _percentile(self, q):
+        points = self._points
+        if points.itemsize != 1:
+            return np.percentile(points, q)
+
+        # linear interpolation between ranks, ranks read from the cumulative histogram
+        last = len(points) - 1
+        cdf = np.cumsum(self._histogram())
+        h = np.asarray(q, np.float64) * (last / 100)
+        k = np.floor(h)
+        v0 = np.searchsorted(cdf, k, 'right')
+        v1 = np.searchsorted(cdf, np.minimum(k + 1, last), 'right')
+        return v0 + (h - k) * (v1 - v0) - 128
+
+
     def median(self):
         """
         Returns:
             float: Median voltage.
         """
-        v = float(np.median(self._points))
+        v = float(self._percentile(50))
         return round(v * self.sy + self.ty, 3)
 
 
@@ -604,7 +708,7 @@ class Frame:
         Returns:
             float: RMS voltage.
         """
-        yy = self._points + np.float32(self.ty / self.sy)
+        yy = self._points + self._tysy32
         return round(_rms(yy) * self.sy, 3)
 
 
@@ -613,7 +717,7 @@ class Frame:
         Returns:
             float: Standard deviation.
         """
-        ys = self._points + np.float32(self.ty / self.sy)
+        ys = self._points + self._tysy32
         return round(ys.std() * self.sy, 3)
 
 
@@ -631,7 +735,8 @@ class Frame:
         ys = ys - np.float32(ys.mean())  # remove DC component
 
         if ys.max() > 15:
-            ii = np.nonzero((ys[1:] >= 0) & (ys[:-1] < 0))[0]  # indexes of positive crossings
+            neg = ys < 0
+            ii = np.nonzero(neg[:-1] > neg[1:])[0]  # indexes of positive crossings
 
             if ii.size > 1:
                 size  = np.diff(ii).max() * 0.8                               # threshold period size
@@ -645,13 +750,23 @@ class Frame:
         return None, None
 
 
+    def _histogram(self):
+        if self._counts is None:
+            if self._points.dtype != np.int8:
+                raise TypeError("Frame levels require ADC samples (int8), got %s" % self._points.dtype)
+            offset = self._points.view(np.uint8) ^ np.uint8(0x80)  # int8 to uint8 + 128
+            self._counts = np.bincount(offset, minlength=256)
+        return self._counts
+
+
     def _get_levels(self):
-        points = self._points + 128
-        counts = np.bincount(points, minlength=256)
-        m = np.dot(counts, range(256)) // len(points)
-        lo = np.argmax(counts[:m + 1]) - 128
-        hi = np.argmax(counts[m:]) + m - 128
-        return lo, hi
+        if self._levels is None:
+            counts = self._histogram()
+            m = np.dot(counts, _adc_values) // len(self._points) + 128  # mean, offset by 128
+            lo = np.argmax(counts[:m + 1]) - 128
+            hi = np.argmax(counts[m:]) + m - 128
+            self._levels = lo, hi
+        return self._levels
 
 
     def levels(self):
@@ -683,8 +798,23 @@ class Frame:
         Returns:
             ndarray: 1D Numpy array of 0 and 1.
         """
+        return self._get_ttl(ratio_low, ratio_high).copy()
+
+
+    def _get_ttl(self, ratio_low=0.2, ratio_high=0.4):
+        # cached TTL levels, read-only since shared by the decoders
+        cache = self._ttl
+        if cache and cache[:2] == (ratio_low, ratio_high):
+            return cache[2]
+
+        ttl = self._to_ttl(self._points, ratio_low, ratio_high)
+        ttl.flags.writeable = False
+        self._ttl = ratio_low, ratio_high, ttl
+        return ttl
+
+
+    def _to_ttl(self, points, ratio_low, ratio_high):
         lo, hi = self._get_levels()
-        points = self._points
 
         if (hi - lo) < 16:
             lo = _min(lo, -self.ty / self.sy)  # Vbase to 0v if Vtop == Vbase
@@ -692,12 +822,15 @@ class Frame:
                 return np.zeros(points.size, np.int8)  # no signal
 
         ttl = points > int(lo + (hi - lo) * ratio_high)
-        nlo = points > int(lo + (hi - lo) * ratio_low)
+        sets = points <= int(lo + (hi - lo) * ratio_low)
+        sets |= ttl
 
-        for i in range(1, len(ttl)):
-            ttl[i] = ttl[i] or nlo[i] and ttl[i - 1]  # n-1 if neither high or low
+        # state is set where high or low, else held from the previous set point
+        hold = np.arange(len(ttl))
+        hold *= sets
+        np.maximum.accumulate(hold, out=hold)
 
-        return ttl.astype(np.int8)
+        return ttl[hold].view(np.int8)
 
 
     def describe(self):
@@ -722,12 +855,22 @@ class Frame:
         """
         import pandas
 
-        y = self.y()
-        vmin = round(y.min(), 3)
-        vmax = round(y.max(), 3)
+        if self._points.dtype == np.int8:
+            # moments from the histogram of the ADC values
+            counts = self._histogram()
+            ii = np.flatnonzero(counts)
+            yv = _adc_values * self.sy + self.ty
+            vmin = round(float(yv[ii[0]]), 3)
+            vmax = round(float(yv[ii[-1]]), 3)
+            vavg = round(float(np.dot(counts, yv)) / self.size, 3)
+            vrms = round(sqrt(np.dot(counts, yv * yv) / self.size), 3)
+        else:  # filtered or computed samples
+            y = self._y()
+            vmin = round(float(y.min()), 3)
+            vmax = round(float(y.max()), 3)
+            vavg = round(float(y.mean()), 3)
+            vrms = round(_rms(y), 3)
         vpp  = round(vmax - vmin, 3)
-        vavg = round(y.mean(), 3)
-        vrms = round(_rms(y), 3)
         vbase, vtop = ( round(v, 3) for v in self.levels() )
         vamp = round(vtop - vbase, 3)
         # freq = round(self.frequency, 3) if self.frequency else None
@@ -774,7 +917,7 @@ class Frame:
             tuple: ( frequencies (Hz), magnitudes (Vmax), phases (-1+1) ).
         """
 
-        ft, scale = _rfft(self.y(), window, size)
+        ft, scale = _rfft(self._y(), window, size)
         ftx = np.linspace(0, 1 / 2 / self.sx, len(ft))  # frequencies (Hz)
         ftm = np.abs(ft) * scale                        # magnitudes (Vmax)
         ftp = ( np.angle(ft) / pi + 2.5 ) % 2 - 1       # phases from center (-1+1)
@@ -795,7 +938,7 @@ class Frame:
         """
         dy = _parse.ratio(threshold=threshold) * ADC_MAX
 
-        pts = self._points + np.float32(self.ty / self.sy)
+        pts = self._points + self._tysy32
         ft, scale = _rfft(pts, window, size)
 
         ft_mag = np.abs(ft) * scale  # magnitude (points)
@@ -807,7 +950,7 @@ class Frame:
         if not ii:
             return tuple()
 
-        xx, mm = zip(*( _quad_iterp(ft_mag, i) for i in ii ))  # interpolate magnitudes
+        xx, mm = _quad_iterp(ft_mag, np.array(ii))  # interpolate magnitudes
 
         frequencies = [ round(x / len(ft) / 2 / self.sx)     for x in xx ]  # Hz
         magnitudes  = [ self.sy * m                          for m in mm ]  # Vmax
@@ -998,7 +1141,7 @@ class Frames(tuple):
         dx = 0
 
         for frame in self:
-            f = frame.slice(start, stop)
+            f = frame._slice(start, stop)
             dx = f.tx - frame.tx
             items[f.channel] = f
 
@@ -1015,7 +1158,7 @@ class Frames(tuple):
         assert ch1.sy == ch2.sy, "Volt range different between channels"
 
         f = copy(ch1)
-        f.buffer = ch1._points - (ch2._points + np.float32(ch2.ty / ch2.sy))
+        f.buffer = ch1._points - (ch2._points + ch2._tysy32)
         f.frequency = None
 
         return Frames((f, None), self.clock)
@@ -1027,8 +1170,8 @@ class Frames(tuple):
         Returns:
             `float`
         """
-        y1 = self.ch1.y()
-        y2 = self.ch2.y()
+        y1 = self.ch1._y()
+        y2 = self.ch2._y()
         pwr_P  = np.dot(y1, y2) / len(y1)  # real power
         pwr_S  = _rms(y1) * _rms(y2)       # apparent power
         pf     = float(pwr_P / pwr_S)      # power factor
@@ -1229,7 +1372,7 @@ class Stream:
         def agg_frames(frames):
             if self.clock is None:
                 self.clock = frames.clock
-            return frames.clock - self.clock, *( func(f) for f in frames )
+            return frames.clock - self.clock, *map(func, frames)
 
         return self.map(agg_frames)
 
@@ -1389,14 +1532,18 @@ class VDS1022:
         self._ep_read = None
         self._failures = 0
         self._clock = 0
-        self._buffer = array('b', bytes(6000))
+        self._buffer = array('b', bytes(6000))  # array for the backend buffer_info()
+        self._samples = np.frombuffer(self._buffer, np.int8)  # ndarray view of _buffer
+        self._packed = { s.size: array('B', bytes(s.size))  # packed command by size, reused
+                         for s in (CMD.IBB, CMD.IBH, CMD.IBI) }
 
         # Synchronization / waiter
         self._lock = threading.Lock()
         self._stop = threading.Event()
+        self._closed = threading.Event()  # set once the device is disposed
 
         # Pending commands
-        self._queue = collections.OrderedDict()
+        self._queue = {}  # insertion ordered
 
         # connect device
         if not self._connect():
@@ -1418,9 +1565,10 @@ class VDS1022:
             while self._handle:
                 clock = self._clock
 
-                if self._stop.wait(3):
-                    time.sleep(0.01)
-                elif self._clock == clock:
+                if self._closed.wait(3):
+                    return
+
+                if self._clock == clock and not self._stop.is_set():  # idle for 3s
                     try:
                         with self._lock:
                             self._send(CMD.SET_RUNSTOP, 1)  # [ 0:run, 1:stop ]
@@ -1499,6 +1647,7 @@ class VDS1022:
     def dispose(self):
         """ Disconnect the device and release resources. """
         self._stop.set()
+        self._closed.set()
 
         with self._lock:
             self._queue.clear()
@@ -1546,7 +1695,6 @@ class VDS1022:
 
 
     def _bulk_write(self, buffer):
-        gc.collect(0)  # prevents long gc and timeout between write and read
         self._usb.bulk_write(self._handle, self._ep_write, USB_INTERFACE, buffer, USB_TIMEOUT)
         self._clock = time.perf_counter()
 
@@ -1558,11 +1706,20 @@ class VDS1022:
         return ret
 
 
+    def _transfer(self, request, buffer, size=None):
+        # write a request and read the response, gc paused to prevent a timeout in between
+        _pause_gc()
+        try:
+            self._bulk_write(request)
+            return self._bulk_read(buffer, size)
+        finally:
+            _resume_gc()
+
+
     def _send(self, cmd, arg):
         while True:
             try:
-                self._bulk_write(cmd.pack(arg))
-                ret = self._bulk_read(self._buffer, 5)
+                ret = self._transfer(cmd.pack(arg, self._packed[cmd.struct.size]), self._buffer, 5)
                 cmd.log(arg, ret, self._buffer)
                 status, value = CMD.BI.unpack_from(self._buffer)
                 return value
@@ -1578,14 +1735,18 @@ class VDS1022:
 
 
     def _push(self, cmd, arg):
-        self._queue.pop(cmd, None)  # remove the command if already in queue
-        self._queue[cmd] = arg
+        queue = self._queue
+        if cmd in queue:
+            del queue[cmd]  # move the command to the end of the queue
+        queue[cmd] = arg
 
 
     def _submit(self):
-        n = len(self._queue)
-        while self._queue:
-            self._send(*self._queue.popitem(False))
+        queue = self._queue
+        n = len(queue)
+        while queue:
+            cmd = next(iter(queue))  # oldest first
+            self._send(cmd, queue.pop(cmd))
         return n
 
 
@@ -1600,8 +1761,7 @@ class VDS1022:
         """
         with self._lock:
             self._queue.pop(cmd, None)
-            while self._queue:
-                self._send(*self._queue.popitem(False))
+            self._submit()
             return self._send(cmd, arg)
 
 
@@ -1619,19 +1779,29 @@ class VDS1022:
 
     def _load_calibration(self):
 
-        for fpath in glob.glob(self.calibration_path):
+        fpath = self.calibration_path
+        if not path.isfile(fpath):
+            return
+
+        # reuse the parsed file until it's modified
+        mtime = path.getmtime(fpath)
+        cached = _calibrations.get(fpath)
+        if cached is None or cached[0] != mtime:
             with open(fpath, 'r') as f:
                 try:
-                    self.calibration = json.load(f)['cals']
+                    cached = _calibrations[fpath] = (mtime, json.loads(f.read())['cals'])
                 except json.JSONDecodeError as ex:
                     _logger.error('Failed to load local calibration')
-                    pass
+                    cached = None
 
-                if DEBUG:
-                    _log("Load " + path.basename(self.calibration_path))
-                    _log_calibration(self.calibration)
+        if cached is not None:
+            self.calibration = deepcopy(cached[1])
 
-                return True
+        if DEBUG:
+            _log("Load " + path.basename(fpath))
+            _log_calibration(self.calibration)
+
+        return True
 
 
     def _save_calibration(self):
@@ -1639,6 +1809,9 @@ class VDS1022:
         with open(self.calibration_path, 'w') as f:
             json.dump({'cals': self.calibration}, f, indent=4)
 
+        # the mtime may not change on a coarse filesystem, evict the parsed file
+        _calibrations.pop(self.calibration_path, None)
+
 
     def save_flash(self, fname):
         """ Save the device flash memory to a file.
@@ -1658,13 +1831,19 @@ class VDS1022:
             array('B'): array of unsigned bytes
         """
         with self._lock:
-            assert len(self._buffer) > FLASH_SIZE
+            self._read_flash()
+            return self._buffer[:FLASH_SIZE]  # copy, the buffer is reused
 
-            self._bulk_write(CMD.READ_FLASH.pack(1))
-            ret = self._bulk_read(self._buffer, FLASH_SIZE)
-            CMD.READ_FLASH.log(1, ret, self._buffer)
 
-            return self._buffer[:FLASH_SIZE]
+    def _read_flash(self):
+        # flash dump as a view of the device buffer, valid until the next read
+        assert len(self._buffer) > FLASH_SIZE
+
+        cmd = CMD.READ_FLASH.pack(1, self._packed[CMD.READ_FLASH.struct.size])
+        ret = self._transfer(cmd, self._buffer, FLASH_SIZE)
+        CMD.READ_FLASH.log(1, ret, self._buffer)
+
+        return memoryview(self._buffer)[:FLASH_SIZE]
 
 
     def write_flash(self, source):
@@ -1689,8 +1868,7 @@ class VDS1022:
             buffer[:2] = array('B', (0x55, 0xAA))
 
             self._send(CMD.WRITE_FLASH, 1)
-            self._bulk_write(buffer)
-            self._bulk_read(buffer, 5)
+            self._transfer(buffer, buffer, 5)
             assert buffer[0] == CMD.S, "Bad response status: " + chr(buffer[0])
 
         _printf("Done overwriting Flash memory.")
@@ -1723,20 +1901,19 @@ class VDS1022:
     def _load_flash(self, fname=None):
 
         if fname is None:
-            buffer = self.read_flash()
+            with self._lock:
+                reader = _FlashStream(self._read_flash())  # copied by the reader
         else:
             with open(fname, 'rb') as f:
-                buffer = f.read()
-
-        reader = _FlashStream(buffer)
+                reader = _FlashStream(f.read())
 
         flash_header, flash_version = reader.read('<HI')
         assert flash_header in (0x55AA, 0xAA55), "Bad flash header: 0x%X" % flash_header
         assert flash_version == 2, "Bad flash version: %d" % flash_version
 
-        reader.seek(6)
-        self.calibration = [ [ list(reader.read('<10H')) for _ in range(CHANNELS) ]
-                             for _ in (GAIN, AMPL, COMP) ]
+        # u16[3][CHANNELS][10] at offset 6 for (GAIN, AMPL, COMP)
+        cals = np.frombuffer(reader.buffer, '<u2', 3 * CHANNELS * 10, 6)
+        self.calibration = cals.reshape(3, CHANNELS, 10).tolist()
 
         reader.seek(206)
         self.oem       = reader.read('<B')      # 1
@@ -1761,7 +1938,7 @@ class VDS1022:
         self.calibration_path = path.join(_dir, self.serial + '-cals.json')
 
         if DEBUG:
-            crc32 = binascii.crc32(reader.buffer[2:]) & 0xFFFFFFFF
+            crc32 = zlib.crc32(memoryview(reader.buffer)[2:]) & 0xFFFFFFFF
             _log("# oem=%s version=%s serial=%s phasefine=%s crc32=%08X" % (
                     self.oem, self.version, self.serial, self.phasefine, crc32))
             _log_calibration(self.calibration)
@@ -1784,7 +1961,7 @@ class VDS1022:
                 dump = f.read()
 
             if DEBUG:
-                crc32 = binascii.crc32(dump) & 0xFFFFFFFF
+                crc32 = zlib.crc32(dump) & 0xFFFFFFFF
                 _log("Load firmware %s (CRC32=%08X)" % (path.basename(paths[-1]), crc32))
 
             frame_size = self._send(CMD.LOAD_FPGA, len(dump))
@@ -1793,12 +1970,19 @@ class VDS1022:
             header = struct.Struct('<I')
             payload_size = frame_size - header.size
             frame_count = ceil(len(dump) / payload_size)
+            frame = array('B', bytes(frame_size))  # part id + payload, reused
+            data = memoryview(dump)
 
             for i, start in enumerate(range(0, len(dump), payload_size)):
                 print(" loading firmware part %s/%s" % (i + 1, frame_count), end='\r')
 
-                self._bulk_write(array('B', header.pack(i) + dump[start: start + payload_size]))
-                self._bulk_read(self._buffer, 5)
+                payload = data[start: start + payload_size]
+                if len(payload) < payload_size:  # last part
+                    frame = array('B', bytes(header.size + len(payload)))
+                header.pack_into(frame, 0, i)
+                memoryview(frame)[header.size:] = payload
+
+                self._transfer(frame, self._buffer, 5)
                 status, value = CMD.BI.unpack_from(self._buffer)
                 assert status == CMD.S, "\nBad status: " + chr(status)
                 assert value == i, "\nBad part id. Expected %s, got %s" % (i, value)
@@ -2018,8 +2202,9 @@ class VDS1022:
                 assert len(lvls) == 2, "Parameter level requires 2 values"
                 assert ADC_MIN <= lvls[0] <= ADC_MAX, "Parameter level[0] not in range %s" % levels[0]
                 assert ADC_MIN <= lvls[1] <= ADC_MAX, "Parameter level[1] not in range %s" % levels[1]
-                self._push(CMD.SET_SLOPE_THRED[chl], _u16(max(lvls), min(lvls)))
-                self._push(CMD.SET_FREQREF[chl], _u8(sum(lvls) // 2))  # freq meter
+                lo, hi = sorted(lvls)
+                self._push(CMD.SET_SLOPE_THRED[chl], _u16(hi, lo))
+                self._push(CMD.SET_FREQREF[chl], _u8((lo + hi) // 2))  # freq meter
 
             # pulse/slope width
             if mode in (PULSE, SLOPE):
@@ -2092,10 +2277,14 @@ class VDS1022:
             tuple: (lower, upper)
         """
         if channel is None:
-            yy = [ self.voltrange[chl] * self.probe[chl] * (r - self.voltoffset[chl])
-                   for r in (-0.5, 0.5)
-                   for chl, on in enumerate(self.on) if on ]
-            return min(yy), max(yy)
+            lows, highs = [], []
+            for chl, on in enumerate(self.on):
+                if on:
+                    voltrange = self.voltrange[chl] * self.probe[chl]
+                    ty = voltrange * -self.voltoffset[chl]
+                    lows.append(ty - voltrange / 2)
+                    highs.append(ty + voltrange / 2)
+            return min(lows), max(highs)
         else:
             chl = _parse.constant(channel=channel)
             voltrange = self.voltrange[chl] * self.probe[chl]
@@ -2225,7 +2414,7 @@ class VDS1022:
             buffer  = self._buffer
             delay   = _max(0, 1 / freq - 0.05) if freq else 0
             start   = FRAME_SIZE - SAMPLES - (0 if self.rollmode else 50)  # right or center
-            points  = np.frombuffer(buffer, np.int8, SAMPLES, offset=start)
+            points  = self._samples[start: start + SAMPLES]
             frames  = [ None ] * CHANNELS
             changed = False
             wait    = 0
@@ -2236,16 +2425,17 @@ class VDS1022:
 
         while True:
             with self._lock:
-
                 if self._submit() > 5:
                     wait = 0.25  # initial time for freq meter
                 else:
                     wait = _clip(delay - self._clock + clock, 0, delay)
 
-                while True:
-                    if self._stop.wait(wait):
-                        return
+            while True:
+                # wait unlocked so that other threads can send commands meanwhile
+                if self._stop.wait(wait):
+                    return
 
+                with self._lock:
                     if self.sweepmode :  # ONCE or NORMAL
                         if not self._send(CMD.GET_DATAFINISHED, 0) \
                             or not self._send(CMD.GET_TRIGGERED, 0):
@@ -2267,13 +2457,13 @@ class VDS1022:
                         cursor = SAMPLES - _clip(cursor, 0, SAMPLES)  # invert cursor from right to left
                         offset = cursor - (SAMPLES * self.trigger_position)  # samples to trigger origin
                         frequency = time_sum and period_num / time_sum * SAMPLING_RATES[-1]  # frequency meter
-                        frames[chl] = Frame(self, chl, buffer[start + cursor: start + SAMPLES], offset, frequency)
+                        frames[chl] = Frame(self, chl, points[cursor:], offset, frequency)
 
                     if self._submit() > 2:  # if sent _adjust_range commands
                         wait = 0.2
                         continue
 
-                    break
+                break
 
             clock = self._clock
             yield Frames(frames, clock)
@@ -2281,19 +2471,22 @@ class VDS1022:
 
     def _pull_data(self, chl_on, buffer):
 
-        # b0-7:CH1  b8-15:CH2  [ 0x04:OFF 0x05:ON ]
-        arg  = int.from_bytes(((4, 5)[on] for on in chl_on), 'little')
+        key  = tuple(chl_on)
+        arg  = _CHL_STATES[key]
+        cmd  = _GET_DATA_CMDS[key]
+        head = CMD.BIIH.unpack_from  # frame header: channel, time_sum, period_num, cursor
         n    = sum(chl_on)
         wait = 0  # wait 0ms if first attempt, 60ms otherwise
 
         i = 0
         while i < n:
             try:
-                self._bulk_write(CMD.GET_DATA.pack(arg))
-
                 i = 0
                 while i < n:
-                    ret = self._bulk_read(buffer)
+                    if i == 0:
+                        ret = self._transfer(cmd, buffer)  # request and first frame
+                    else:
+                        ret = self._bulk_read(buffer)
                     CMD.GET_DATA.log(arg, ret, buffer)
 
                     if ret != FRAME_SIZE:  # if EBUSY
@@ -2303,7 +2496,7 @@ class VDS1022:
                         wait = 0.06
                         break
 
-                    yield CMD.BIIH.unpack_from(buffer)
+                    yield head(buffer)
                     i += 1
 
             except USBError as ex:
@@ -2412,9 +2605,10 @@ class VDS1022:
                 self.on[CH1] = True  # turn on CH1 if all channels are off
 
             buffer   = self._buffer
+            samples  = self._samples
             adc_size = ADC_SIZE + 20  # cursor becomes circular with ADC_SIZE + 20
-            cmd_arg  = int.from_bytes(((4, 5)[on] for on in self.on), 'little')
-            cmd_get  = CMD.GET_DATA.pack(cmd_arg)
+            cmd_get  = _GET_DATA_CMDS[tuple(self.on)]
+            head     = CMD.BIIH.unpack_from  # frame header: channel, time_sum, period_num, cursor
             chl_cnt  = sum(self.on)  # number of used channels
             delay    = _clip(ADC_SIZE / self.sampling_rate / 4 - 0.035 * chl_cnt, 0, 1)
             maxtime  = ADC_SIZE / self.sampling_rate
@@ -2440,22 +2634,24 @@ class VDS1022:
                     break
 
         while True:
-            with self._lock:
-                if self._stop.wait(delay):
-                    return
-
-                self._bulk_write(cmd_get)
+            # wait unlocked so that other threads can send commands meanwhile
+            if self._stop.wait(delay):
+                return
 
-                for _ in range(chl_cnt):
-                    ret = self._bulk_read(buffer)
+            with self._lock:
+                for i in range(chl_cnt):
+                    if i == 0:
+                        ret = self._transfer(cmd_get, buffer)  # request and first frame
+                    else:
+                        ret = self._bulk_read(buffer)
                     assert ret == FRAME_SIZE, 'Bad frame size: %s' % ret
 
-                    chl, _, _, cursor = CMD.BIIH.unpack_from(buffer)
+                    chl, _, _, cursor = head(buffer)
                     size = (cursor - cursors[chl] + adc_size) % adc_size  # count new samples
                     assert size > 0, "Bad cursor %d: " % cursor
 
                     cursors[chl] = cursor
-                    frames[chl] = Frame(self, chl, buffer[FRAME_SIZE - size: FRAME_SIZE], offset, None)
+                    frames[chl] = Frame(self, chl, samples[FRAME_SIZE - size: FRAME_SIZE], offset, None)
 
                 assert self._clock - clock < maxtime, "Missed some samples! Reduce the sampling rate"
                 clock = self._clock
@@ -2470,7 +2666,7 @@ class VDS1022:
         """
         with self._lock:
 
-            points  = np.frombuffer(self._buffer, np.int8, SAMPLES, FRAME_SIZE - SAMPLES - 50)
+            points  = self._samples[FRAME_SIZE - SAMPLES - 50: FRAME_SIZE - 50]
             rate    = SAMPLING_RATES[-1]
             tries   = 0
             hits    = 0
@@ -2560,7 +2756,7 @@ class VDS1022:
             self._initialize()
 
             calibration = deepcopy(self.calibration)
-            points = np.frombuffer(self._buffer, np.int8, SAMPLES, FRAME_SIZE - SAMPLES - 50)
+            points = self._samples[FRAME_SIZE - SAMPLES - 50: FRAME_SIZE - 50]
 
             for cals in calibration[COMP]:
                 cals[:] = ( _clip(x, 500 , 600) for x in cals )  # clip zero-compensation